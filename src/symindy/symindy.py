@@ -1,10 +1,11 @@
+import copy
+import functools
 import logging
-import operator
+import os
 import random
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
-import matplotlib.pyplot as plt
-import networkx as nx
 import numpy as np
 import pysindy as ps
 from deap import base, creator, gp, tools
@@ -12,6 +13,500 @@ from sklearn.metrics import r2_score
 
 from symindy.library import Library
 
+# Optional accelerators for evaluating compiled trees. Preference order:
+# numba (njit lowers the whole expression through LLVM, giving one fused,
+# SIMD-vectorized native loop - the same end result as emitting LLVM IR by
+# hand, without carrying an IR builder), then numexpr (fuses the ufunc chain
+# into one threaded pass), then the plain gp.compile callable.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+# DEAP creator classes are registered once at import time: creator.create
+# mutates a module-global namespace, so re-creating the classes on every
+# fit() triggers DEAP warnings, rebuilds the classes and re-registers their
+# pickling paths (needed by process-pool workers). The guards keep repeated
+# imports idempotent.
+if not hasattr(creator, "FitnessMax"):
+    creator.create("FitnessMax", base.Fitness, weights=(1.0,))
+if not hasattr(creator, "Subindividual"):
+    creator.create("Subindividual", gp.PrimitiveTree)
+if not hasattr(creator, "Individual"):
+    creator.create("Individual", list, fitness=creator.FitnessMax)
+
+# Cache of compiled subindividuals keyed by their string form. PrimitiveTree
+# has a stable string representation, so subtrees left untouched by
+# crossover/mutation reuse their compiled callable across fitness evaluations
+# instead of being recompiled every generation.
+# Height bound enforced on subtrees after crossover/mutation (the same bound
+# the gp.staticLimit decorators used to apply).
+_MAX_TREE_HEIGHT = 2
+
+_COMPILE_CACHE_MAXSIZE = 4096
+_compile_cache = {}
+
+
+def _compile_tree(tree, toolbox):
+    """Compile a subindividual into a callable, reusing a cached callable
+    if a tree with the same string form was compiled before under the same
+    primitive-set arguments. The argument tuple is part of the key because
+    every compiled callable bakes in the arity of its pset - an entry cached
+    while fitting a 2D system must not be served when fitting a 3D one.
+    Parameters:
+        tree - deap.gp.PrimitiveTree, subindividual to compile
+        toolbox - deap base toolbox instance with a registered compile method
+            (gp.compile with a bound pset)
+    Returns:
+        callable evaluating the tree expression
+    """
+    pset = getattr(toolbox.compile, "keywords", {}).get("pset")
+    key = (tuple(pset.arguments) if pset is not None else None, str(tree))
+    fn = _compile_cache.get(key)
+    if fn is None:
+        if len(_compile_cache) >= _COMPILE_CACHE_MAXSIZE:
+            _compile_cache.clear()
+        fn = toolbox.compile(expr=tree)
+        # try the accelerators in preference order; a tree numba cannot
+        # type still gets the numexpr fused pass before the plain fallback
+        accelerated = _maybe_njit(fn) if njit is not None else None
+        if accelerated is None:
+            accelerated = _maybe_numexpr(tree, fn)
+        fn = accelerated or fn
+        _compile_cache[key] = fn
+    return fn
+
+
+def _warmup_compile_cache(pset, toolbox):
+    """Pre-compile the smallest expressions over the pset - every lone
+    argument and every primitive applied to arguments - so their (possibly
+    JIT-backed) callables sit in the compile cache before the first
+    generation is evaluated. fit calls this before creating the worker
+    pool: forked workers inherit the warm cache, so none of them pays the
+    first-call numba compilation for these ubiquitous subtrees."""
+    args = pset.arguments
+    exprs = list(args)
+    for prim in pset.primitives[pset.ret]:
+        operands = ", ".join(args[i % len(args)] for i in range(prim.arity))
+        exprs.append("{}({})".format(prim.name, operands))
+    for expr in exprs:
+        try:
+            _compile_tree(gp.PrimitiveTree.from_string(expr, pset), toolbox)
+        except Exception:
+            # warm-up is best effort; an uncompilable expression just stays
+            # out of the cache
+            pass
+
+
+# numexpr templates for the primitives registered by Library
+_NUMEXPR_OPS = {
+    "add": "({}) + ({})",
+    "mul": "({}) * ({})",
+    "sin": "sin({})",
+    "cos": "cos({})",
+}
+
+
+def _tree_to_numexpr(tree):
+    """Translate a PrimitiveTree into a numexpr expression string.
+    Walks the tree in prefix order, mapping the Library primitives through
+    _NUMEXPR_OPS and emitting terminals verbatim (argument names/constants).
+    Returns None if the tree uses a primitive numexpr cannot express."""
+
+    def build(i):
+        node = tree[i]
+        args = []
+        j = i + 1
+        for _ in range(node.arity):
+            sub, j = build(j)
+            if sub is None:
+                return None, j
+            args.append(sub)
+        if node.arity == 0:
+            return node.format(), j
+        template = _NUMEXPR_OPS.get(node.name)
+        if template is None:
+            return None, j
+        return template.format(*args), j
+
+    expr, _ = build(0)
+    return expr
+
+
+def _maybe_numexpr(tree, fn):
+    """Wrap a compiled tree in a numexpr-backed callable that evaluates the
+    whole expression in one fused pass over the input columns. Returns None
+    when numexpr is missing or the tree cannot be translated."""
+    if numexpr is None:
+        return None
+    expr = _tree_to_numexpr(tree)
+    if expr is None:
+        return None
+    arg_names = fn.__code__.co_varnames[: fn.__code__.co_argcount]
+    # the wrapper keeps the explicit argument list of the compiled lambda -
+    # pysindy's CustomLibrary infers the function arity from co_argcount
+    source = "def _numexpr_eval({args}):\n    return numexpr.evaluate(expr, local_dict={{{locals}}})".format(
+        args=", ".join(arg_names),
+        locals=", ".join("'{0}': {0}".format(name) for name in arg_names),
+    )
+    namespace = {"numexpr": numexpr, "expr": expr}
+    exec(source, namespace)
+    return namespace["_numexpr_eval"]
+
+
+def _maybe_njit(fn):
+    """JIT-compile a callable with numba if numba is installed.
+    The compiled trees are trivial float64 arithmetic, which is exactly what
+    numba specializes best; pysindy calls them many times per fit, so the
+    one-off compilation cost is amortized through the compile cache.
+    Returns None if numba is missing or typing fails, so the caller can try
+    the next accelerator in the preference order."""
+    if njit is None:
+        return None
+    try:
+        # no cache=True here: gp.compile produces the lambda with eval, so
+        # it has no source file for numba to persist a disk cache against
+        # (asking for one only emits a NumbaWarning per tree)
+        jitted = njit(fastmath=True)(fn)
+        # numba compiles lazily - trigger compilation for the float64 column
+        # signature pysindy uses, falling back if typing fails.
+        jitted(*[np.zeros(1) for _ in range(fn.__code__.co_argcount)])
+        return jitted
+    except Exception:
+        return None
+
+
+# Mating and mutation operators live at module level (rather than as closures
+# inside configure_DEAP) so that the toolbox stays picklable for
+# process-pool based fitness evaluation.
+def _r2_uniform_average(y_true, y_pred):
+    """Coefficient of determination averaged uniformly over outputs,
+    matching sklearn's r2_score default. Implemented as plain array math so
+    scoring a fitness evaluation is one pass over the validation block
+    instead of a metric-object call; JIT-compiled below when numba is
+    installed."""
+    mean = y_true.sum(axis=0) / y_true.shape[0]
+    ss_res = ((y_true - y_pred) ** 2).sum(axis=0)
+    ss_tot = ((y_true - mean) ** 2).sum(axis=0)
+    total = 0.0
+    for j in range(ss_res.shape[0]):
+        if ss_tot[j] > 0.0:
+            total += 1.0 - ss_res[j] / ss_tot[j]
+        elif ss_res[j] == 0.0:
+            # as in sklearn: a constant column predicted exactly scores 1,
+            # an imperfectly predicted one contributes 0
+            total += 1.0
+    return total / ss_res.shape[0]
+
+
+if njit is not None:
+    try:
+        _jitted_r2 = njit(cache=True, fastmath=True)(_r2_uniform_average)
+        _jitted_r2(np.zeros((3, 2)), np.zeros((3, 2)))
+        _r2_uniform_average = _jitted_r2
+    except Exception:
+        pass
+
+
+# STLSQ hyperparameters, shared between the direct solver below (hot path)
+# and the ps.STLSQ optimizer built for the final model so the two cannot
+# drift apart.
+_STLSQ_THRESHOLD = 0.01
+_STLSQ_ALPHA = 0.5
+
+
+def _stlsq(theta, y, threshold=_STLSQ_THRESHOLD, alpha=_STLSQ_ALPHA, max_iter=20):
+    """Sequentially thresholded ridge regression, mirroring the
+    ps.STLSQ optimizer used for the final model without constructing a
+    SINDy model per call. Coefficients below the
+    threshold are zeroed and the remaining ones refitted with ridge
+    regression until the support stops changing; the selected support is
+    then unbiased with a plain least-squares refit, as pysindy does.
+    Parameters:
+        theta - np array of shape (n_samples, n_features), feature block
+        y - np array of shape (n_samples, n_targets), derivatives
+        threshold - float, minimum magnitude for a coefficient to survive
+        alpha - float, ridge regularization strength
+        max_iter - int, maximum number of thresholding iterations
+    Returns:
+        coef - np array of shape (n_targets, n_features)
+    """
+    n_features = theta.shape[1]
+    gram = theta.T @ theta + alpha * np.eye(n_features)
+    rhs = theta.T @ y
+    coef = np.linalg.solve(gram, rhs).T
+    prev_nnz = -1
+    for _ in range(max_iter):
+        small = np.abs(coef) < threshold
+        coef[small] = 0.0
+        nnz = int((~small).sum())
+        if nnz == prev_nnz:
+            break
+        prev_nnz = nnz
+        # batch the targets that share a support into one factorization:
+        # the reduced gram depends only on the support, so a single solve
+        # serves all their right-hand sides
+        support_groups = {}
+        for k in range(coef.shape[0]):
+            support_groups.setdefault(tuple(np.flatnonzero(~small[k])), []).append(k)
+        for support, ks in support_groups.items():
+            idx = np.asarray(support, dtype=np.intp)
+            if idx.size:
+                coef[np.ix_(ks, idx)] = np.linalg.solve(
+                    gram[np.ix_(idx, idx)], rhs[np.ix_(idx, ks)]
+                ).T
+    # unbias the selected support with an unregularized refit, again with
+    # same-support targets sharing one factorization
+    support_groups = {}
+    for k in range(coef.shape[0]):
+        support_groups.setdefault(tuple(np.flatnonzero(coef[k])), []).append(k)
+    for support, ks in support_groups.items():
+        idx = np.asarray(support, dtype=np.intp)
+        if idx.size:
+            coef[np.ix_(ks, idx)] = np.linalg.lstsq(
+                theta[:, idx], y[:, ks], rcond=None
+            )[0].T
+    return coef
+
+
+def _tournament_select(pop_fitness, k, tournsize, rng):
+    """Vectorized tournament selection on the population fitness array.
+    Draws all k*tournsize candidate indices in one call and picks the
+    highest-fitness candidate of each tournament (fitness is maximized),
+    replacing DEAP's per-individual Python loop.
+    Parameters:
+        pop_fitness - np array of per-individual fitness values
+        k - int, number of individuals to select
+        tournsize - int, number of candidates per tournament
+        rng - np.random.Generator
+    Returns:
+        np array of k selected population indices
+    """
+    candidates = rng.integers(0, len(pop_fitness), (k, tournsize))
+    winners = np.argmax(pop_fitness[candidates], axis=1)
+    return candidates[np.arange(k), winners]
+
+
+def _compile_stats(pop_fitness, population):
+    """Compute the per-generation logbook record (the avg/std/min/max
+    fitness and size chapters registered by init_stats) in single numpy
+    passes over the fitness array, instead of DEAP's per-individual
+    generators."""
+    sizes = np.fromiter(
+        map(len, population), dtype=np.int64, count=len(population)
+    )
+    return {
+        "fitness": {
+            "avg": np.mean(pop_fitness),
+            "std": np.std(pop_fitness),
+            "min": np.min(pop_fitness),
+            "max": np.max(pop_fitness),
+        },
+        "size": {
+            "avg": np.mean(sizes),
+            "std": np.std(sizes),
+            "min": np.min(sizes),
+            "max": np.max(sizes),
+        },
+    }
+
+
+# Per-process payload of training data for pool-based fitness evaluation.
+# The pool initializer fills it once per worker, so the arrays are not
+# pickled along with every dispatched task (and under fork they are simply
+# inherited copy-on-write).
+_worker_data = {}
+
+
+def _set_worker_data(payload):
+    """Install the training-data payload for this process. Used as the
+    process-pool initializer and called once in the parent as well (the
+    parent evaluates tiny batches inline)."""
+    _worker_data.clear()
+    _worker_data.update(payload)
+
+
+_FITNESS_MEMO_MAXSIZE = 32768
+
+
+def _evaluate_invalid(invalid_ind, toolbox_local, memo=None):
+    """Evaluate the individuals with invalid fitness, grouping syntactically
+    identical ones (same multiset of subtree strings) so each distinct
+    individual is evaluated once and the fitness is broadcast to its
+    duplicates. Subtree order does not matter: permuting the subtrees only
+    permutes the columns of the feature block and the fitted coefficients,
+    leaving predictions, score and sparsity penalty unchanged - so permuted
+    duplicates share one evaluation too. With a small primitive set and
+    shallow trees duplicates are frequent, so this directly cuts the number
+    of SINDy fits per generation.
+
+    When a memo dict is provided, fitness values are additionally reused
+    across generations: mutation and crossover frequently recreate
+    previously seen individuals, whose fitness is deterministic for fixed
+    training data. The memo lives in the parent process, so cache hits also
+    skip the worker-pool round trip entirely.
+    Returns the number of evaluations actually dispatched."""
+    groups = {}
+    for ind in invalid_ind:
+        groups.setdefault(tuple(sorted(str(tree) for tree in ind)), []).append(ind)
+
+    to_evaluate = []
+    if memo is None:
+        to_evaluate = list(groups)
+    else:
+        for key, members in groups.items():
+            fit = memo.get(key)
+            if fit is None:
+                to_evaluate.append(key)
+            else:
+                for ind in members:
+                    ind.fitness.values = fit
+    fitnesses = toolbox_local.map(
+        toolbox_local.evaluate, [groups[key][0] for key in to_evaluate]
+    )
+    for key, fit in zip(to_evaluate, fitnesses):
+        fit = tuple(fit)
+        for ind in groups[key]:
+            ind.fitness.values = fit
+        if memo is not None:
+            if len(memo) >= _FITNESS_MEMO_MAXSIZE:
+                memo.clear()
+            memo[key] = fit
+    return len(to_evaluate)
+
+
+def _population_fitness(population):
+    """Gather the scalar fitness of every individual into one float64 array
+    (structure-of-arrays view of the population). Vectorized consumers such
+    as the hall-of-fame update read this array instead of walking Python
+    Fitness objects one by one."""
+    return np.fromiter(
+        (ind.fitness.values[0] for ind in population),
+        dtype=np.float64,
+        count=len(population),
+    )
+
+
+_THETA_CACHE_MAXSIZE = 8192
+
+
+def _build_feature_block(sr_functions, x, tree_keys=None, cache=None, out=None):
+    """Evaluate all compiled subexpressions on the data in a single pass,
+    returning an (n_samples, ntrees) feature block. The compiled trees are
+    composed of numpy ufuncs, so evaluating them on whole columns is
+    vectorized; constant subexpressions broadcast into their column.
+
+    When a cache dict is provided, evaluated columns are shared across
+    individuals: the same subtree typically appears in many individuals of a
+    population (small primitive set, shallow trees), so its column is
+    computed once per data block and reused for the rest of the run.
+    Parameters:
+        sr_functions - list of callables compiled from the subindividuals
+        x - np array of shape (n_samples, dims)
+        tree_keys - list of str, string form of each subindividual. Required
+            when cache is not None.
+        cache - dict mapping (tree string, n_samples) to a precomputed
+            column, or None to disable column sharing.
+        out - optional preallocated (n_samples, ntrees) buffer to fill,
+            turning the per-evaluation block allocation into a reuse.
+    Returns:
+        theta - np array of shape (n_samples, len(sr_functions))
+    """
+    cols = [x[:, d] for d in range(x.shape[1])]
+    shape = (x.shape[0], len(sr_functions))
+    if out is not None and out.shape == shape:
+        theta = out
+    else:
+        theta = np.empty(shape)
+    for j, fn in enumerate(sr_functions):
+        if cache is None:
+            theta[:, j] = fn(*cols)
+            continue
+        key = (tree_keys[j], x.shape[0])
+        col = cache.get(key)
+        if col is None:
+            if len(cache) >= _THETA_CACHE_MAXSIZE:
+                cache.clear()
+            col = fn(*cols)
+            cache[key] = col
+        theta[:, j] = col
+    return theta
+
+
+def _split_train_val(arr, n_tr):
+    """Split an array into train and validation views at index n_tr.
+    Returns (None, None) for None input; a scalar (e.g. a constant timestep)
+    is passed through to both parts unchanged."""
+    if arr is None:
+        return None, None
+    if np.ndim(arr) == 0:
+        return arr, arr
+    return arr[:n_tr], arr[n_tr:]
+
+
+@functools.lru_cache(maxsize=32)
+def _base_pset(nc, dimensions, library_name):
+    """Primitive set for a library configuration, built once per
+    configuration. Callers must deep-copy the returned pset before
+    registering it: DEAP mutates it (renameArguments, toolbox bindings),
+    and repeated fit() calls - hyperparameter sweeps, CV loops - share
+    the cached instance."""
+    return Library(nc, dimensions, library_name=library_name)()
+
+
+# Cache of tree-graph layouts used by plot_trees. The graphviz dot layout
+# spawns a subprocess per graph, which dominates plotting cost when elites
+# are redrawn across generations; structurally identical subtrees reuse the
+# computed positions instead.
+_LAYOUT_CACHE_MAXSIZE = 1024
+_layout_cache = {}
+
+
+def _tree_layout(nx, g):
+    """Node positions for a subtree graph, cached by its exact structure.
+    gp.graph numbers nodes in a fixed prefix order, so structurally equal
+    subtrees share a cache key. Prefers the graphviz dot layout and falls
+    back to networkx's subprocess-free kamada_kawai layout when pygraphviz
+    is not installed."""
+    key = (g.number_of_nodes(), tuple(g.edges()))
+    pos = _layout_cache.get(key)
+    if pos is None:
+        if len(_layout_cache) >= _LAYOUT_CACHE_MAXSIZE:
+            _layout_cache.clear()
+        try:
+            pos = nx.nx_agraph.pygraphviz_layout(g, prog="dot")
+        except Exception:
+            pos = nx.kamada_kawai_layout(g)
+        _layout_cache[key] = pos
+    return pos
+
+
+def _random_mating_operator(ind1, ind2, roll=None):
+    # roll is pre-drawn in a vectorized batch by _my_varAnd; drawing here
+    # is the fallback for direct toolbox use
+    if roll is None:
+        roll = random.random()
+    if roll < 0.5:
+        return gp.cxOnePoint(ind1, ind2)
+    elif roll < 1.5:
+        return gp.cxOnePointLeafBiased(ind1, ind2, termpb=0.5)
+
+
+def _random_mutation_operator(individual, pset, roll=None):
+    if roll is None:
+        roll = random.random()
+    if roll < 0.5:
+        return gp.mutInsert(individual, pset=pset)
+    elif roll < 0.66:
+        return gp.mutShrink(individual)
+    elif roll < 2.66:
+        return gp.mutNodeReplacement(individual, pset=pset)
+
 
 class SymINDy:
     def __init__(
@@ -30,6 +525,7 @@ class SymINDy:
         sindy_kwargs=None,
         nc=0,
         seed=0,
+        n_jobs=1,
         verbose=False
         ):
         """
@@ -58,6 +554,10 @@ class SymINDy:
             sindy_kwargs - dict, key value arguments for to instanciate SINDy class with.
             nc - int, number of numeric constants associated to individual. Default = 0. Experimental parameter.
             seed - float or int, random seed for reproducibility. Default = 0.
+            n_jobs - int, number of worker processes used to evaluate fitness. Fitness evaluations
+                (independent SINDy fits) are embarrassingly parallel, so a persistent process pool
+                is created once per fit and reused across generations. 1 - serial evaluation,
+                -1 - use all available cores. Default = 1.
             verbose - bool, if True, print metric after fitting each generation. Default = False.
         Attributes:
         ----------
@@ -79,6 +579,12 @@ class SymINDy:
         self.sindy_kwargs = sindy_kwargs
         self.nc = nc
         self.seed = seed
+        # instance-owned RNG; the variation rolls are derived from it so
+        # per-instance reproducibility does not depend on the global random
+        # state (DEAP's own tree generation still uses the global module,
+        # which fit() seeds)
+        self.rng = random.Random(seed)
+        self.n_jobs = n_jobs
         self.verbose = verbose
         if self.verbose:
             logging.info(self.__class__.__name__ + '__init__')
@@ -100,27 +606,13 @@ class SymINDy:
                 dimensions - int, read from txt files as n columns
                 max_depth - int, max depth of symbolic tree
         Returns:
-            toolbox, creator, pset, history - deap object instances. See the link above
+            toolbox, creator, pset, history - deap object instances. See the link above.
+            creator is the module-level deap.creator namespace (the classes are
+            registered once at import time), returned to keep the signature stable.
         """
         if self.verbose:
             logging.info(self.__class__.__name__ + 'configure_DEAP')
 
-        def _random_mating_operator(ind1, ind2):
-            roll = random.random()
-            if roll < 0.5:
-                return gp.cxOnePoint(ind1, ind2)
-            elif roll < 1.5:
-                return gp.cxOnePointLeafBiased(ind1, ind2, termpb=0.5)
-
-        def _random_mutation_operator(individual):
-            roll = random.random()
-            if roll < 0.5:
-                return gp.mutInsert(individual, pset=pset)
-            elif roll < 0.66:
-                return gp.mutShrink(individual)
-            elif roll < 2.66:
-                return gp.mutNodeReplacement(individual, pset=pset)
-
         def _rename_args(pset, nc, dimensions):
             """Rename arguments in a primitive set.
             Parameters:
@@ -140,21 +632,15 @@ class SymINDy:
             return pset
 
         def _create_toolbox(pset, ntrees, max_depth=2):
-            """Create a deap toolbox, creator and history objects.
+            """Create a deap toolbox and history object. The creator classes
+            are registered once at module import time.
             Parameters:
                 pset - primitive set to register in the toolbox
                 ntrees - number of trees of symbolic expressions per subindividual
                 max_depth - int, max depth of symbolic tree
             Returns:
-                toolbox, creator, history
+                toolbox, history
             """
-            from deap import \
-                creator  # TODO figure out why the globally imported creator is not seen inside this function.
-
-            creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-            # subindividual is a primitive tree which is populated from pset
-            creator.create("Subindividual", gp.PrimitiveTree)
-            creator.create("Individual", list, fitness=creator.FitnessMax)
             toolbox = base.Toolbox()
             toolbox.register(
                 "expr",
@@ -178,29 +664,22 @@ class SymINDy:
             toolbox.register("compile", gp.compile, pset=pset)
             toolbox.register("select", tools.selTournament, tournsize=2)
             toolbox.register("mate", _random_mating_operator)
-            toolbox.register("mutate", _random_mutation_operator)
+            toolbox.register("mutate", _random_mutation_operator, pset=pset)
             history = tools.History()
             toolbox.decorate("mate", history.decorator)
             toolbox.decorate("mutate", history.decorator)
-            toolbox.decorate(
-                "mate", gp.staticLimit(key=operator.attrgetter("height"), max_value=2)
-            )
-            toolbox.decorate(
-                "mutate", gp.staticLimit(key=operator.attrgetter("height"), max_value=2)
-            )
-            return toolbox, creator, history
+            # the height bound is enforced inline in _my_varAnd instead of
+            # via gp.staticLimit decorators
+            return toolbox, history
 
         self.max_depth = max_depth
-        lib = Library(
-            nc,
-            dimensions,
-            library_name=self.library_name,
-        )
-        pset = lib()
+        # the cached pset is shared across fits of the same configuration;
+        # work on a private copy since the registrations below mutate it
+        pset = copy.deepcopy(_base_pset(nc, dimensions, self.library_name))
 
         pset = _rename_args(pset, nc, dimensions)
 
-        toolbox, creator, history = _create_toolbox(
+        toolbox, history = _create_toolbox(
             pset, ntrees, max_depth=self.max_depth
         )
         return toolbox, creator, pset, history
@@ -211,7 +690,7 @@ class SymINDy:
         ntrees,
         max_depth,
         toolbox,
-        x_train,
+        x_train = None,
         x_dot_train = None,
         time_rec_obs = None,
         sindy_kwargs = None,
@@ -220,6 +699,13 @@ class SymINDy:
         flag_solution = False,
         tr_te_ratio = 0.8,
         sparsity_coef = 1,
+        x_val = None,
+        x_dot_val = None,
+        time_val = None,
+        theta_cache = None,
+        theta_buf_train = None,
+        theta_buf_val = None,
+        max_nnodes = None,
         ):
         """Fitness function to evaluate symbolic regression.
         For additional documentation see SINDy model docs
@@ -244,26 +730,26 @@ class SymINDy:
                     If None, no train test split. If not none, no train test split is done. Default = 0.8
                 sparsity_coef - float, coefficient to multiply the sparsity penatly with (n_zero_nodes/max_n_nodes).
                     Default = 1
+                x_val, x_dot_val, time_val - optional pre-sliced validation data. If x_val is not None,
+                    the model is fitted on x_train and scored on x_val without doing any per-call
+                    splitting (fit precomputes these views once). Default = None.
+                theta_cache - optional dict shared across evaluations of one fit run; stores
+                    evaluated feature columns per subtree so identical subtrees appearing in
+                    different individuals are computed once per data block. Default = None.
+                theta_buf_train, theta_buf_val - optional preallocated buffers for the train and
+                    validation feature blocks, reused across evaluations instead of allocating
+                    fresh arrays per call. Default = None.
+                max_nnodes - int, normalization constant of the sparsity penalty. Invariant over
+                    a GA run, so fit precomputes it once; Default = None, computed from max_depth
+                    and ntrees.
         Returns:
                 [fitness] - list with fitness value. NB - DEAP requires output to be iterable (so, it shall be
                         a tuple or a list).
         """
 
-        def validate_input(x_train):
-            """check input e.g. x_train shall have at least 3 timepoints (requirement of pysindy
-            differentiation package)."""
-            if x_train.shape[0] < 3:
-                raise ValueError("x_train shall have at least 3 timepounts!")
-
-        def create_sindy_model(individual, toolbox, sindy_kwargs):
-            """Create sindy model instance with the custom library generated by DEAP"""
-            # Transform the tree expression in a callable function
-            sr_functions = []
-            for i in range(ntrees):
-                sr_functions.append(toolbox.compile(expr=individual[i]))
-            library = ps.CustomLibrary(library_functions=sr_functions)
-
-            stlsq_optimizer = ps.STLSQ(threshold=.01, alpha=.5)
+        def create_sindy_model(library, sindy_kwargs):
+            """Create sindy model instance with the provided feature library"""
+            stlsq_optimizer = ps.STLSQ(threshold=_STLSQ_THRESHOLD, alpha=_STLSQ_ALPHA)
             model = ps.SINDy(feature_library=library, **sindy_kwargs, optimizer=stlsq_optimizer)
             return model
 
@@ -307,22 +793,98 @@ class SymINDy:
             score_metric = r2_score
         if score_metric_kwargs is None:
             score_metric_kwargs = {}
-
-        validate_input(x_train)
-
-        model = create_sindy_model(individual, toolbox, sindy_kwargs)
-
-        # if train test split, fit the model on train set and score on test set
-        split = (
-            lambda x, ratio: (x[: int(ratio * len(x))], x[int(ratio * len(x)) :])
-            if x is not None
-            else (None, None)
+        if x_train is None and _worker_data:
+            # Pool workers get the training data once through the pool
+            # initializer instead of having it pickled with every task;
+            # a None x_train means "use the per-process payload".
+            x_train = _worker_data["x_train"]
+            x_dot_train = _worker_data["x_dot_train"]
+            time_rec_obs = _worker_data["time_rec_obs"]
+            x_val = _worker_data["x_val"]
+            x_dot_val = _worker_data["x_dot_val"]
+            time_val = _worker_data["time_val"]
+            theta_cache = _worker_data["theta_cache"]
+            theta_buf_train = _worker_data["theta_buf_train"]
+            theta_buf_val = _worker_data["theta_buf_val"]
+
+        tree_keys = [str(individual[i]) for i in range(ntrees)]
+
+        # Degenerate individuals where every subtree is the same expression
+        # produce a rank-one feature block; they cannot outscore an individual
+        # with distinct subtrees, so penalize them outright instead of paying
+        # for compilation and a full regression. (Lone-terminal subtrees are
+        # not degenerate here - the pset has no constant terminals, so a
+        # single terminal is always an input variable and a valid feature.)
+        if not flag_solution and ntrees > 1 and len(set(tree_keys)) == 1:
+            return [-1e6]
+
+        # Transform the tree expressions in callable functions
+        sr_functions = [_compile_tree(individual[i], toolbox) for i in range(ntrees)]
+
+        # On the hot path (fitness only, precomputed derivatives) evaluate
+        # all ntrees subexpressions once per data block and fit/score on the
+        # precomputed features. This avoids pysindy re-evaluating the custom
+        # library separately in fit and score, turning 2*ntrees passes over
+        # the data into one block build each. Covers both the pre-sliced
+        # validation data coming from fit and the no-split case.
+        use_precomputed_features = (
+            not flag_solution
+            and x_dot_train is not None
+            and ((x_val is not None and x_dot_val is not None)
+                 or (x_val is None and tr_te_ratio is None))
         )
 
-        if tr_te_ratio is not None:
-            x_train_tr, x_train_te = split(x_train, tr_te_ratio)
-            x_dot_train_tr, x_dot_train_te = split(x_dot_train, tr_te_ratio)
-            time_tr, time_te = split(time_rec_obs, tr_te_ratio)
+        if use_precomputed_features:
+            theta_train = _build_feature_block(
+                sr_functions, x_train, tree_keys, theta_cache, theta_buf_train
+            )
+            # solve the sparse regression directly - no per-eval SINDy
+            # object construction, validation or optimizer wrapping
+            coef = _stlsq(theta_train, np.asarray(x_dot_train, dtype=np.float64))
+            if x_val is not None:
+                theta_val = _build_feature_block(
+                    sr_functions, x_val, tree_keys, theta_cache, theta_buf_val
+                )
+                pred_val = theta_val @ coef.T
+                target_val = x_dot_val
+            else:
+                # no train/test split - score on the training block itself
+                pred_val = theta_train @ coef.T
+                target_val = x_dot_train
+            if score_metric is r2_score and not score_metric_kwargs:
+                # default metric - score with the single-pass R2 kernel
+                fitness = float(
+                    _r2_uniform_average(
+                        np.asarray(target_val, dtype=np.float64), pred_val
+                    )
+                )
+            else:
+                fitness = score_metric(target_val, pred_val, **score_metric_kwargs)
+            coefficients = coef
+        elif x_val is not None:
+            # pre-sliced data from fit - no per-call splitting work
+            model = create_sindy_model(
+                ps.CustomLibrary(library_functions=sr_functions), sindy_kwargs
+            )
+            model = fit_sindy_model(model, x_train, x_dot_train, time_rec_obs)
+            model, fitness = score_sindy_model(
+                model,
+                x_val,
+                time_val,
+                x_dot_val,
+                score_metric,
+                score_metric_kwargs,
+            )
+        elif tr_te_ratio is not None:
+            model = create_sindy_model(
+                ps.CustomLibrary(library_functions=sr_functions), sindy_kwargs
+            )
+            # fit gets here only with pre-sliced data; this split runs solely
+            # for direct calls, so compute the index once and slice views
+            n_tr = int(tr_te_ratio * len(x_train))
+            x_train_tr, x_train_te = _split_train_val(x_train, n_tr)
+            x_dot_train_tr, x_dot_train_te = _split_train_val(x_dot_train, n_tr)
+            time_tr, time_te = _split_train_val(time_rec_obs, n_tr)
             model = fit_sindy_model(model, x_train_tr, x_dot_train_tr, time_tr)
             model, fitness = score_sindy_model(
                 model,
@@ -333,6 +895,9 @@ class SymINDy:
                 score_metric_kwargs,
             )
         else:
+            model = create_sindy_model(
+                ps.CustomLibrary(library_functions=sr_functions), sindy_kwargs
+            )
             model = fit_sindy_model(model, x_train, x_dot_train, time_rec_obs)
             model, fitness = score_sindy_model(
                 model,
@@ -343,17 +908,22 @@ class SymINDy:
                 score_metric_kwargs,
             )
 
+        if not use_precomputed_features:
+            coefficients = model.coefficients()
+
         # Sparsity penalty - coerce the model to keep nnodes as small as possible
-        # n_samples, nterms = model.coefficients().shape # terms - subindivuduals and their interaction: len(individual)*n_samples
-        ind_coefs_list = np.split(model.coefficients().T.reshape(-1), ntrees)
-        n_nodes = 0
-        for i in range(ntrees):
-            # if zero subindividual
-            if np.all(ind_coefs_list[i] == 0):
-                continue
-            n_nodes += len(individual[i])
-        # len(individual)* # 2 max n inputs among dict funcs, (1+2) - max depath
-        max_nnodes = 2 ** (1 + max_depth) * ntrees
+        # n_samples, nterms = coefficients.shape # terms - subindivuduals and their interaction: len(individual)*n_samples
+        # each subindividual owns one row of the transposed coefficient
+        # matrix; the reshape is a zero-copy view, unlike the list of chunks
+        # np.split used to allocate here
+        ind_coefs = coefficients.T.reshape(ntrees, -1)
+        # count nodes only of the subindividuals with nonzero coefficients
+        sizes = np.fromiter((len(individual[i]) for i in range(ntrees)), dtype=np.intp)
+        active = ind_coefs.any(axis=1)
+        n_nodes = int(sizes[active].sum())
+        if max_nnodes is None:
+            # len(individual)* # 2 max n inputs among dict funcs, (1+2) - max depath
+            max_nnodes = 2 ** (1 + max_depth) * ntrees
         # normalize n_nodes by max n_nodes (self.max_depth)
         fitness -= sparsity_coef * (n_nodes / max_nnodes)
 
@@ -376,6 +946,8 @@ class SymINDy:
         stats=None,
         halloffame=None,
         verbose=False,
+        fitness_memo=None,
+        rng=None,
     ):
         """
         Takes in a population and evolves it in place using the varAnd() method.
@@ -391,6 +963,10 @@ class SymINDy:
                 stats – A DEAP Statistics object that is updated inplace. Default=None.
                 halloffame – A DEAP HallOfFame object that will contain the best individuals. Default=None.
                 verbose – Whether or not to log the statistics. Default=__debug__.
+                fitness_memo - optional dict caching fitness values by individual structure
+                        across generations. Default=None, no cross-generation caching.
+                rng - optional np.random.Generator driving the variation and selection
+                        rolls. Default=None, seeded from the global random stream.
         Returns:
                 population: The final population
                 logbook - a logbook object with the statistics of the evolution.
@@ -404,7 +980,7 @@ class SymINDy:
                         population = offspring
         """
 
-        def _my_varAnd(population, toolbox_local, cxpb, mutpb):
+        def _my_varAnd(population, toolbox_local, cxpb, mutpb, rng):
             """
             Part of an evolutionary algorithm applying only the variation part (crossover and mutation).
             See https://deap.readthedocs.io/en/master/api/algo.html#deap.algorithms.varAnd for the reference.
@@ -414,80 +990,146 @@ class SymINDy:
                     toolbox_local
                     cxpb - float, is the probability with which two individuals are crossed
                     mutpb - float, is the probability for mutating an individual
+                    rng - np.random.Generator used to pre-draw all variation rolls at once
             Returns:
                     offspring - a "list" of varied individuals that are independent of their parents (deepcopied)
                     halloffame - deap halloffame object. Contains the best individual that
                         ever lived in the popultion (best over all generations)
             """
-            # Create an offspring list sampled from the population
-            offspring = [toolbox_local.clone(ind) for ind in population]
+            offspring = list(population)
+
+            # Pre-draw all variation rolls for the generation in a few
+            # vectorized calls instead of up to len(offspring)*(1+ntrees)
+            # Python-level RNG calls inside the loops.
+            mate_rolls = rng.random(len(offspring) // 2)
+            h_components = rng.integers(0, ntrees, len(offspring) // 2)
+            mut_rolls = rng.random((len(offspring), ntrees))
+            # operator-choice rolls consumed inside the mating/mutation
+            # operators, pre-drawn here for the same reason
+            op_rolls_mate = rng.random(len(offspring) // 2)
+            op_rolls_mut = rng.random((len(offspring), ntrees))
+
+            # With all rolls pre-drawn, the set of individuals an operator
+            # will touch is known upfront; clone exactly those once and keep
+            # plain references for the rest. Untouched individuals keep
+            # their parent's valid fitness and are never modified in place,
+            # so sharing is safe and the remaining deepcopy work is skipped.
+            touched = np.any(mut_rolls < mutpb, axis=1)
+            for j in np.nonzero(mate_rolls < cxpb)[0]:
+                touched[2 * j] = True
+                touched[2 * j + 1] = True
+            for i in np.nonzero(touched)[0]:
+                offspring[i] = toolbox_local.clone(offspring[i])
 
             # Apply crossover and mutation on the offspring
             for i in range(1, len(offspring), 2):
                 # for h_component in range(ntrees):
-                if random.random() < cxpb:
-                    h_component = random.randint(
-                        0, ntrees - 1
-                    )  # where do we define ntrees?
+                if mate_rolls[i // 2] < cxpb:
+                    h_component = int(h_components[i // 2])
+                    backup1 = copy.deepcopy(offspring[i - 1][h_component])
+                    backup2 = copy.deepcopy(offspring[i][h_component])
                     (
                         offspring[i - 1][h_component],
                         offspring[i][h_component],
                     ) = toolbox_local.mate(
-                        offspring[i - 1][h_component], offspring[i][h_component]
+                        offspring[i - 1][h_component],
+                        offspring[i][h_component],
+                        roll=float(op_rolls_mate[i // 2]),
                     )
-                    del offspring[i - 1].fitness.values, offspring[i].fitness.values
+                    if (
+                        offspring[i - 1][h_component].height > _MAX_TREE_HEIGHT
+                        or offspring[i][h_component].height > _MAX_TREE_HEIGHT
+                    ):
+                        # revert the crossover; the individuals are unchanged,
+                        # so their fitness stays valid and is not re-evaluated
+                        offspring[i - 1][h_component] = backup1
+                        offspring[i][h_component] = backup2
+                    else:
+                        # invalidate by assigning wvalues directly - it is
+                        # all the values deleter does (valid is defined as
+                        # len(wvalues) != 0), minus the property machinery
+                        offspring[i - 1].fitness.wvalues = ()
+                        offspring[i].fitness.wvalues = ()
 
             for i in range(len(offspring)):
                 for h_component in range(ntrees):
-                    if random.random() < mutpb:
+                    if mut_rolls[i, h_component] < mutpb:
                         # h_component = random.randint(0, ntrees-1)
+                        backup = copy.deepcopy(offspring[i][h_component])
                         (offspring[i][h_component],) = toolbox_local.mutate(
-                            offspring[i][h_component]
+                            offspring[i][h_component],
+                            roll=float(op_rolls_mut[i, h_component]),
                         )
-                        del offspring[i].fitness.values
+                        if offspring[i][h_component].height > _MAX_TREE_HEIGHT:
+                            offspring[i][h_component] = backup
+                        else:
+                            offspring[i].fitness.wvalues = ()
             return offspring
 
         logbook = tools.Logbook()
         logbook.header = ["gen", "nevals"] + (stats.fields if stats else [])
 
+        # Generator for the pre-drawn variation rolls; fit passes one derived
+        # from the instance-owned RNG, the fallback seeds from the global
+        # random stream so runs stay reproducible for a given seed.
+        if rng is None:
+            rng = np.random.default_rng(random.getrandbits(64))
+
         # Evaluate the fitness of the first population
         invalid_ind = [ind for ind in population if not ind.fitness.valid]
-        fitnesses = toolbox_local.map(toolbox_local.evaluate, invalid_ind)
-        for ind, fit in zip(invalid_ind, fitnesses):
-            ind.fitness.values = fit
-            if verbose:
-                print("Fitness: " + str(fit))
+        _evaluate_invalid(invalid_ind, toolbox_local, fitness_memo)
+        if verbose:
+            for ind in invalid_ind:
+                print("Fitness: " + str(list(ind.fitness.values)))
 
+        # Structure-of-arrays view of the population fitness, refreshed after
+        # each evaluation round and consumed by vectorized bookkeeping.
+        pop_fitness = _population_fitness(population)
         if halloffame is not None:
-            halloffame.update(population)
-        record = stats.compile(population) if stats else {}
+            if halloffame.maxsize == 1:
+                # a size-1 hall of fame only needs the argmax candidate
+                halloffame.update([population[int(np.argmax(pop_fitness))]])
+            else:
+                halloffame.update(population)
+        if stats is not None and set(stats.fields) == {"fitness", "size"}:
+            record = _compile_stats(pop_fitness, population)
+        else:
+            record = stats.compile(population) if stats else {}
         logbook.record(gen=0, nevals=len(invalid_ind), **record)
         if verbose:
             logbook.stream
 
         # Begin the generational process
         for gen in range(1, ngen + 1):
-            # Select the next generation individuals
-            offspring = toolbox_local.select(population, len(population))
+            # Select the next generation individuals via the vectorized
+            # tournament on the fitness array (tournsize matches the
+            # selTournament operator registered on the toolbox)
+            selected = _tournament_select(pop_fitness, len(population), 2, rng)
+            offspring = [population[int(j)] for j in selected]
 
             # Vary the pool of individuals
-            offspring = _my_varAnd(offspring, toolbox_local, cxpb, mutpb)
+            offspring = _my_varAnd(offspring, toolbox_local, cxpb, mutpb, rng)
 
             # Evaluate the individuals with an invalid fitness
             invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            fitnesses = toolbox_local.map(toolbox_local.evaluate, invalid_ind)
-            for ind, fit in zip(invalid_ind, fitnesses):
-                ind.fitness.values = fit
+            _evaluate_invalid(invalid_ind, toolbox_local, fitness_memo)
 
             # Update the hall of fame with the generated individuals
+            pop_fitness = _population_fitness(offspring)
             if halloffame is not None:
-                halloffame.update(offspring)
+                if halloffame.maxsize == 1:
+                    halloffame.update([offspring[int(np.argmax(pop_fitness))]])
+                else:
+                    halloffame.update(offspring)
 
             # Replace the current population by the offspring
             population[:] = offspring
 
             # Append the current generation statistics to the logbook
-            record = stats.compile(population) if stats else {}
+            if stats is not None and set(stats.fields) == {"fitness", "size"}:
+                record = _compile_stats(pop_fitness, population)
+            else:
+                record = stats.compile(population) if stats else {}
             logbook.record(gen=gen, nevals=len(invalid_ind), **record)
             if verbose:
                 print(logbook.stream)
@@ -522,30 +1164,106 @@ class SymINDy:
         if self.verbose:
             logging.info(self.__class__.__name__ + 'fit')
 
-        # set random seed
+        # validate input once instead of on every fitness evaluation
+        # (pysindy differentiation requires at least 3 timepoints)
+        if x_train.shape[0] < 3:
+            raise ValueError("x_train shall have at least 3 timepounts!")
+
+        # Normalize the training data once to the contiguous float64 layout
+        # the numeric kernels expect, so no per-evaluation dtype coercion or
+        # copying happens on the hot path.
+        x_train = np.ascontiguousarray(x_train, dtype=np.float64)
+        if x_dot_train is not None:
+            x_dot_train = np.ascontiguousarray(x_dot_train, dtype=np.float64)
+        if time_rec_obs is not None and np.ndim(time_rec_obs) > 0:
+            time_rec_obs = np.ascontiguousarray(time_rec_obs, dtype=np.float64)
+
+        # set random seed. The global module is still seeded because DEAP's
+        # tree generation draws from it; the variation/selection rolls come
+        # from the instance-owned RNG, reseeded so repeated fits of one
+        # instance are identical.
         random.seed(self.seed)
+        self.rng.seed(self.seed)
+
+        # Differentiate the training data once here rather than letting every
+        # model.fit call inside evalSymbReg recompute the same derivatives
+        # (n_individuals*ngen redundant passes otherwise). Only valid for the
+        # default continuous-time FiniteDifference setup: a discrete-time
+        # model never differentiates (it targets shifted states) and a
+        # user-supplied differentiation_method must be applied by ps.SINDy
+        # itself. In those cases x_dot_train stays None, which routes
+        # evaluation through the model-fitting branch honoring sindy_kwargs.
+        sindy_kwargs = self.sindy_kwargs or {}
+        if (
+            x_dot_train is None
+            and not sindy_kwargs.get("discrete_time")
+            and "differentiation_method" not in sindy_kwargs
+        ):
+            time = time_rec_obs if time_rec_obs is not None else 1
+            x_dot_train = ps.FiniteDifference()._differentiate(x_train, time)
+
+        # Precompute the train/validation split once. The slices are zero-copy
+        # views, so fitness evaluations do no splitting work on the hot path.
+        tr_te_ratio = 0.8
+        n_tr = int(tr_te_ratio * len(x_train))
+        x_tr, x_val = _split_train_val(x_train, n_tr)
+        x_dot_tr, x_dot_val = _split_train_val(x_dot_train, n_tr)
+        time_tr, time_val = _split_train_val(time_rec_obs, n_tr)
 
         # Initiate DEAP
         toolbox, creator, pset, history = self.configure_DEAP(
             ntrees=self.ntrees, nc=self.nc, dimensions=self.dims
         )
 
+        # evalSymbReg only needs toolbox.compile. Bind it to a minimal toolbox
+        # so the registered evaluation function stays picklable for worker
+        # processes (the full toolbox holds decorated operators which do not
+        # pickle).
+        compile_toolbox = base.Toolbox()
+        compile_toolbox.register("compile", gp.compile, pset=pset)
+
+        # Warm the compile cache with the ubiquitous one-node/one-primitive
+        # subtrees before any evaluation happens and before the worker pool
+        # forks below.
+        _warmup_compile_cache(pset, compile_toolbox)
+
+        # Data arguments of the fitness function. In parallel mode they are
+        # shipped to each worker once through the pool initializer instead of
+        # being bound here (bound arguments get pickled with every dispatched
+        # task, which re-serializes the training arrays per batch).
+        eval_data = dict(
+            x_train=x_tr,
+            x_dot_train=x_dot_tr,
+            time_rec_obs=time_tr,
+            x_val=x_val,
+            x_dot_val=x_dot_val,
+            time_val=time_val,
+            theta_cache={},
+            theta_buf_train=np.empty((n_tr, self.ntrees)),
+            theta_buf_val=np.empty((len(x_train) - n_tr, self.ntrees)),
+        )
+        # normalization constant of the sparsity penalty, invariant over the run
+        max_nnodes = 2 ** (1 + self.max_depth) * self.ntrees
+        if self.n_jobs != 1:
+            # the parent evaluates near-empty batches inline, so it needs
+            # the payload installed as well
+            _set_worker_data(eval_data)
+
         # Register evaluation fucntion (add arguments from init)
         toolbox.register(
             "evaluate",
             self.evalSymbReg,
             ntrees=self.ntrees,
             max_depth=self.max_depth,
-            toolbox=toolbox,
-            x_train=x_train,
-            x_dot_train=x_dot_train,
-            time_rec_obs=time_rec_obs,
+            toolbox=compile_toolbox,
             sindy_kwargs=self.sindy_kwargs,
             score_metric=self.score_metric,
             score_metric_kwargs=self.score_metric_kwargs,
             flag_solution=False,
-            tr_te_ratio=0.8,
+            tr_te_ratio=tr_te_ratio,
             sparsity_coef=self.sparsity_coef,
+            max_nnodes=max_nnodes,
+            **({} if self.n_jobs != 1 else eval_data),
         )
 
         # Register function to train SINDy model and retrieve it
@@ -554,16 +1272,20 @@ class SymINDy:
             self.evalSymbReg,
             ntrees=self.ntrees,
             max_depth=self.max_depth,
-            toolbox=toolbox,
-            x_train=x_train,
-            x_dot_train=x_dot_train,
-            time_rec_obs=time_rec_obs,
+            toolbox=compile_toolbox,
+            x_train=x_tr,
+            x_dot_train=x_dot_tr,
+            time_rec_obs=time_tr,
             sindy_kwargs=self.sindy_kwargs,
             score_metric=self.score_metric,
             score_metric_kwargs=self.score_metric_kwargs,
             flag_solution=True,
-            tr_te_ratio=0.8,
+            tr_te_ratio=tr_te_ratio,
             sparsity_coef=self.sparsity_coef,
+            x_val=x_val,
+            x_dot_val=x_dot_val,
+            time_val=time_val,
+            max_nnodes=max_nnodes,
         )
 
         mstats = self.init_stats()
@@ -571,18 +1293,50 @@ class SymINDy:
         pop = toolbox.population(n=self.n_individuals)
         hof_ = tools.HallOfFame(1)
 
+        # Evaluate fitness in parallel with a persistent pool of worker
+        # processes, created once and reused across all generations.
+        executor = None
+        if self.n_jobs != 1:
+            # No on-disk numba cache is configured here: the tree kernels are
+            # eval-built lambdas numba cannot persist, and the file-backed
+            # kernels are compiled at import time. Workers inherit all
+            # already-compiled kernels through fork.
+            max_workers = self.n_jobs if self.n_jobs > 0 else os.cpu_count()
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_set_worker_data,
+                initargs=(eval_data,),
+            )
+
+            def _parallel_map(func, iterable):
+                items = list(iterable)
+                # a near-empty batch (e.g. late generations dominated by
+                # duplicates) is cheaper to run inline than to ship to workers
+                if len(items) <= 2:
+                    return [func(item) for item in items]
+                chunksize = max(1, len(items) // (4 * max_workers))
+                return list(executor.map(func, items, chunksize=chunksize))
+
+            toolbox.register("map", _parallel_map)
+
         # Run the evolution
-        pop, log, hof = self.my_eaSimple(
-            pop,
-            toolbox,
-            cxpb=self.cxpb,
-            mutpb=self.mutpb,
-            ngen=self.ngen,
-            ntrees=self.ntrees,
-            stats=mstats,
-            halloffame=hof_,
-            verbose=self.verbose,
-        )
+        try:
+            pop, log, hof = self.my_eaSimple(
+                pop,
+                toolbox,
+                cxpb=self.cxpb,
+                mutpb=self.mutpb,
+                ngen=self.ngen,
+                ntrees=self.ntrees,
+                stats=mstats,
+                halloffame=hof_,
+                verbose=self.verbose,
+                fitness_memo={},
+                rng=np.random.default_rng(self.rng.getrandbits(64)),
+            )
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         # Train SINDy model with the best individual
         final_model = toolbox.retrieve_model(hof[0])
@@ -664,8 +1418,10 @@ class SymINDy:
 
     def plot_trees(self, show=False):
         """Plot the tree of the best individuals (hof[0]).
-        Note, this function requires pygraphviz to be installed which is often installed separately
-        for windows. Issue: https://stackoverflow.com/questions/40809758/howto-install-pygraphviz-on-windows-10-64bit
+        Note, the nicer graphviz dot layout requires pygraphviz which is often installed separately
+        for windows (issue: https://stackoverflow.com/questions/40809758/howto-install-pygraphviz-on-windows-10-64bit);
+        without it a networkx fallback layout is used. Layouts are cached, so repeated
+        plotting of unchanged elites skips the layout computation.
         Parameters:
             show - bool, if True, show the figure.
         Returns:
@@ -673,6 +1429,10 @@ class SymINDy:
         """
         if self.verbose:
             logging.info(self.__class__.__name__ + 'plot_trees')
+        # plotting-only dependencies are imported lazily so that fitting does
+        # not pay their import cost (matters for process-pool worker startup)
+        import matplotlib.pyplot as plt
+        import networkx as nx
         try:
             expr = self.hof[0]
             fig, axs = plt.subplots(
@@ -685,7 +1445,7 @@ class SymINDy:
                 g = nx.Graph()
                 g.add_nodes_from(nodes)
                 g.add_edges_from(edges)
-                pos = nx.nx_agraph.pygraphviz_layout(g, prog="dot")
+                pos = _tree_layout(nx, g)
                 nx.draw(
                     g,
                     pos,